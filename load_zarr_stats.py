@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import argparse
 import csv
+import functools
+import hashlib
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 import math
@@ -12,6 +15,27 @@ import math
 import requests
 import yaml
 import re
+from requests.adapters import HTTPAdapter
+
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader
+
+try:
+    import requests_cache
+except ImportError:  # pragma: no cover - optional dependency
+    requests_cache = None
+
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover - optional dependency
+    pd = None
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # pragma: no cover - optional dependency
+    from json import loads as json_loads
 
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -29,74 +53,147 @@ log = logging.getLogger("load_zarr_stats")
 # ────────────────────────────────────────────────────────────────────────────────
 HERE = Path(__file__).parent
 
+# ────────────────────────────────────────────────────────────────────────────────
+# HTTP configuration
+# ────────────────────────────────────────────────────────────────────────────────
+MAX_WORKERS = 16
+DATASET_WORKERS = 8
+MAX_CONNECTIONS = 32
+
+# Number of CSV rows buffered before they are appended to the output file
+FLUSH_EVERY = 64
+
+HTTP_CACHE = HERE / ".http_cache"
+HTTP_CACHE_EXPIRE = 24 * 60 * 60  # seconds
+
+# Final load_zarr stats, keyed by URL + root zarr.json ETag
+STATS_CACHE = HERE / ".stats_cache"
+
+# Shared session so TCP/TLS connections are reused across requests and threads.
+# With requests-cache installed, responses are also kept on disk between runs and
+# revalidated with conditional GETs (ETag / Last-Modified) once they expire.
+# 404s are cached too: most stores have no ro-crate-metadata.json or
+# OME/METADATA.ome.xml, and nothing in zarr.json says so up front.
+if requests_cache is not None:
+    SESSION = requests_cache.CachedSession(
+        HTTP_CACHE,
+        backend="sqlite",
+        expire_after=HTTP_CACHE_EXPIRE,
+        allowable_codes=(200, 404),
+        stale_if_error=True,
+    )
+else:
+    SESSION = requests.Session()
+
+# URL workers each fan out over dataset levels, so block until a pooled connection
+# frees up instead of opening surplus ones that are then discarded
+_adapter = HTTPAdapter(
+    pool_connections=MAX_CONNECTIONS, pool_maxsize=MAX_CONNECTIONS, pool_block=True
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
 
 # ────────────────────────────────────────────────────────────────────────────────
 # Utility functions
 # ────────────────────────────────────────────────────────────────────────────────
 
 
-def detect_ome_zarr_kind(root_zarr_json: dict) -> str:
+# (key in attributes.ome, kind), in priority order
+_KIND_PROBES = (
+    ("plate", "plate"),
+    ("well", "well"),
+    ("bioformats2raw.layout", "bioformats2raw"),
+    ("multiscales", "image_with_multiscales"),
+)
+
+
+def classify_root(root_zarr_json: dict) -> tuple[str, dict, dict]:
     """
     Classify the root of an OME-Zarr store into one of:
       image_with_multiscales, image_no_multiscales, label,
       bioformats2raw, plate, well
+
+    Returns (kind, ome, attrs) so callers can reuse the parsed
+    'attributes' and 'attributes.ome' dicts.
     """
     attrs = root_zarr_json.get("attributes", {}) or {}
     ome = attrs.get("ome", {}) or {}
 
-    # Highest-priority structural kinds
-    if ome.get("plate"):
-        return "plate"
-    if ome.get("well"):
-        return "well"
-    if ome.get("bioformats2raw.layout"):
-        return "bioformats2raw"
-
-    # Image vs label
-    if ome.get("multiscales"):
-        return "image_with_multiscales"
+    # Structural kinds first, then image vs label
+    for key, kind in _KIND_PROBES:
+        if ome.get(key):
+            return kind, ome, attrs
 
     # Label-only roots:
     #  - NGFF "image-label" on array roots
     #  - Root 'labels' listing without multiscales
     if "image-label" in attrs:
-        return "label"
-    if attrs.get("labels") and not ome.get("multiscales"):
-        return "label"
+        return "label", ome, attrs
+    if attrs.get("labels"):
+        return "label", ome, attrs
+
+    # Arrays without multiscales, and anything else, are images without multiscales
+    return "image_no_multiscales", ome, attrs
 
-    # If the root is an array and we didn't see multiscales, treat as image without multiscales
-    if root_zarr_json.get("node_type") == "array":
-        return "image_no_multiscales"
 
-    # Fallback
-    return "image_no_multiscales"
+# URLs whose fetch failed for a reason other than 404 (timeouts, 5xx, bad JSON)
+FAILED_URLS = set()
 
 
+@functools.lru_cache(maxsize=4096)
 def load_json(url: str):
+    """Fetch and decode a JSON document, memoized per URL for the whole run.
+
+    The returned dict is shared between callers and must not be mutated.
+    """
     try:
         log.debug(f"Fetching JSON: {url}")
-        resp = requests.get(url, timeout=10)
+        resp = SESSION.get(url, timeout=10)
         resp.raise_for_status()
-        return resp.json()
+        # Decode the raw bytes; orjson.JSONDecodeError subclasses JSONDecodeError
+        return json_loads(resp.content)
     except (requests.exceptions.RequestException, json.decoder.JSONDecodeError) as e:
         log.warning(f"Failed to load JSON from {url}: {e}")
+        if getattr(getattr(e, "response", None), "status_code", None) != 404:
+            FAILED_URLS.add(url)
         return {}
 
 
+def has_failed_fetches(zarr_url):
+    """True if any document under zarr_url failed to load for a non-404 reason."""
+    prefix = zarr_url + "/"
+    return any(url.startswith(prefix) for url in list(FAILED_URLS))
+
+
+def prefetch_json(urls):
+    """Fetch a batch of JSON documents concurrently into the load_json cache."""
+    urls = list(dict.fromkeys(urls))
+    with ThreadPoolExecutor(max_workers=DATASET_WORKERS) as executor:
+        list(executor.map(load_json, urls))
+
+
+BYTE_UNITS = ("B", "KB", "MB", "GB", "TB")
+
+
 def format_bytes_human_readable(num_bytes):
-    unit = None
-    for u in ["B", "KB", "MB", "GB", "TB"]:
-        unit = u
-        if num_bytes < 1024.0:
-            break
-        num_bytes /= 1024.0
-    return f"{num_bytes:.2f} {unit}"
+    # Unit index straight from the bit length: each unit is 2**10 larger
+    n = int(num_bytes)
+    i = 0 if n < 1 else min((n.bit_length() - 1) // 10, len(BYTE_UNITS) - 1)
+    return f"{num_bytes / (1 << (10 * i)):.2f} {BYTE_UNITS[i]}"
 
 
 def list_to_str(my_list):
     if not my_list:
         return ""
-    return ",".join(str(item) for item in my_list)
+    if isinstance(my_list, str):
+        return my_list
+    try:
+        # e.g. dimension_names: already strings, join directly
+        return ",".join(my_list)
+    except TypeError:
+        # shapes/chunks, or dimension_names with null entries
+        return ",".join(map(str, my_list))
 
 
 # ────────────────────────────────────────────────────────────────────────────────
@@ -130,42 +227,82 @@ def get_chunk_and_shard_shapes(zarray):
     return {"chunks": chunk_shape, "shape": zarray["shape"]}
 
 
+_DTYPE_BYTES = {
+    "bool": 1,
+    "int8": 1,
+    "uint8": 1,
+    "int16": 2,
+    "uint16": 2,
+    "float16": 2,
+    "int32": 4,
+    "uint32": 4,
+    "float32": 4,
+    "int64": 8,
+    "uint64": 8,
+    "float64": 8,
+    "complex64": 8,
+    "complex128": 16,
+}
+_BITS_RE = re.compile(r"\d+")
+
+
+def get_bytes_per_pixel(data_type: str) -> int:
+    """Bytes per element for a v3 data_type, e.g. 'uint16' -> 2."""
+    bytes_per_pixel = _DTYPE_BYTES.get(data_type)
+    if bytes_per_pixel is not None:
+        return bytes_per_pixel
+
+    # Uncommon names: derive from the bit width, e.g. 'int4' or 'float8_e4m3'
+    m = _BITS_RE.search(data_type)
+    if m:
+        return max(int(m.group()) // 8, 1)
+
+    log.warning(f"Unknown data_type {data_type!r}, assuming 1 byte per pixel")
+    return 1
+
+
+def sum_written(array_jsons):
+    """Total bytes across resolution levels: sum of bytes_per_pixel * prod(shape)."""
+    # Get dtype (v3: 'data_type', not supporting v2: 'dtype')
+    return sum(
+        get_bytes_per_pixel(array_json["data_type"]) * math.prod(array_json["shape"])
+        for array_json in array_jsons
+    )
+
+
+def dataset_urls(zarr_url, multiscales):
+    """zarr.json URLs of every resolution level of the first multiscales."""
+    # Hardcode to use only the first multiscales
+    # See https://ngff.openmicroscopy.org/rfc/6/index.html
+    return [
+        zarr_url + "/" + ds["path"] + "/zarr.json"
+        for ds in multiscales[0]["datasets"]
+    ]
+
+
+def well_image_paths(plate, average_count):
+    """Paths of the first field of the sampled wells of a plate."""
+    return [f"{well['path']}/0" for well in plate["wells"][:average_count]]
+
+
 # Based on https://github.com/ome/ome-ngff-validator/blob/dfa175df9a20d9c2aaf576762472272fe393a3e8/src/JsonValidator/MultiscaleArrays/ZarrArray/index.svelte#L33
-def get_array_values(zarr_url, multiscales):
+def get_array_values(zarr_url, multiscales, prefetched=False):
     # we want chunks, shards, shape from first resolution level...
     # but we want total 'written' bytes for all resolutions...
     dict_data = {}
 
-    # Hardcode to use only the first multiscales
-    # See https://ngff.openmicroscopy.org/rfc/6/index.html
-    for ds in multiscales[0]["datasets"]:
-
-        array_url = zarr_url + "/" + ds["path"]
-        array_json = load_json(array_url + "/zarr.json")
-
-        if len(dict_data) == 0:
-            dict_data = get_chunk_and_shard_shapes(array_json)
-            dict_data["written"] = 0
-
-        # Get dtype (v3: 'data_type', not supporting v2: 'dtype')
-        array_data_type = array_json["data_type"]
-        array_shape = array_json["shape"]
-        if "int" in array_data_type or "float" in array_data_type:
-            m = re.search(r"(\d+)", array_data_type)
-            if m:
-                bytes_per_pixel = int(m.group(1)) // 8
-            else:
-                # fallback for e.g. 'u1', 'i2', 'f4', etc.
-                for n in [1, 2, 4, 8]:
-                    if str(n) in array_data_type:
-                        bytes_per_pixel = n
-                        break
+    array_urls = dataset_urls(zarr_url, multiscales)
 
-        pixels = math.prod(array_shape)
-        total_bytes = bytes_per_pixel * pixels
+    # Resolution levels are independent, so fetch them all at once
+    # (unless the caller already did)
+    if not prefetched:
+        prefetch_json(array_urls)
+    array_jsons = [load_json(url) for url in array_urls]
 
-        dict_data["written"] = dict_data["written"] + total_bytes
-        dict_data["dimension_names"] = array_json.get("dimension_names", "")
+    if array_jsons:
+        dict_data = get_chunk_and_shard_shapes(array_jsons[0])
+        dict_data["written"] = sum_written(array_jsons)
+        dict_data["dimension_names"] = array_jsons[0].get("dimension_names", "")
 
     return dict_data
 
@@ -215,8 +352,10 @@ def load_rocrate(zarr_url):
 def load_series(zarr_url):
     """Return a list of series identifiers."""
     series_url = zarr_url + "/OME/METADATA.ome.xml"
-    rsp = requests.get(series_url)
+    rsp = SESSION.get(series_url, timeout=10)
     if (rsp.status_code // 100) != 2:
+        if rsp.status_code != 404:
+            FAILED_URLS.add(series_url)
         series_json = load_json(zarr_url + "/OME/zarr.json")
         return series_json.get("attributes", {}).get("ome", {}).get("series", [])
     return ["0"]
@@ -225,36 +364,102 @@ def load_series(zarr_url):
 # ────────────────────────────────────────────────────────────────────────────────
 # Main Zarr loader
 # ────────────────────────────────────────────────────────────────────────────────
-def load_zarr(zarr_url, average_count=5):
+def get_stats_cache_path(zarr_url, average_count):
+    """Cache file for this store's stats, or None if the root zarr.json has no ETag.
+
+    Files live in one directory per URL, so entries for older ETags can be pruned.
+    """
+    try:
+        resp = SESSION.head(zarr_url + "/zarr.json", timeout=10)
+    except requests.exceptions.RequestException as e:
+        log.debug(f"HEAD failed for {zarr_url}: {e}")
+        return None
+
+    etag = resp.headers.get("ETag")
+    if not resp.ok or not etag:
+        return None
+
+    url_key = hashlib.sha1(zarr_url.encode()).hexdigest()
+    key = hashlib.sha1(f"{etag}|{average_count}".encode()).hexdigest()
+    return STATS_CACHE / url_key / f"{key}.json"
+
+
+def load_zarr(zarr_url, average_count=5, use_stats_cache=True):
+    """Return stats for a store, reusing cached results while its ETag is unchanged.
+
+    Only the root zarr.json ETag is tracked: changes to the ro-crate, level
+    zarr.json files or series/well documents alone do not invalidate the entry.
+    Pass use_stats_cache=False (--overwrite) to recompute and skip the cache.
+    """
+    if not use_stats_cache:
+        return compute_zarr_stats(zarr_url, average_count)
+
+    cache_path = get_stats_cache_path(zarr_url, average_count)
+    if cache_path is not None and cache_path.exists():
+        log.info(f"Using cached stats for {zarr_url}")
+        return json.loads(cache_path.read_text())
+
+    stats = compute_zarr_stats(zarr_url, average_count)
+
+    # Don't persist results built from failed sub-fetches (e.g. a timed-out
+    # ro-crate): they would be served until the upstream ETag changes
+    if cache_path is not None and stats and not has_failed_fetches(zarr_url):
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        for old_path in cache_path.parent.glob("*.json"):
+            old_path.unlink(missing_ok=True)
+        tmp_path = cache_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(stats))
+        tmp_path.replace(cache_path)
+
+    return stats
+
+
+def compute_zarr_stats(zarr_url, average_count=5):
     log.info(f"Loading Zarr: {zarr_url}")
 
     # Assuming v0.5
-    response = load_json(zarr_url + "/zarr.json")
+    root_url = zarr_url + "/zarr.json"
+    response = load_json(root_url)
+
+    # A transient failure (timeout, 5xx) must not produce a row, or append
+    # mode would treat the URL as done and never retry it
+    if root_url in FAILED_URLS:
+        raise RuntimeError(f"Could not fetch {root_url}")
 
     if not response:
         log.error(f"No zarr.json found at {zarr_url}")
         return {}
 
-    ome_zarr_kind = detect_ome_zarr_kind(response)
+    ome_zarr_kind, ome_json, _attrs = classify_root(response)
 
-    ome_json = response.get("attributes", {}).get("ome", {})
     multiscales = ome_json.get("multiscales")
     plate = ome_json.get("plate")
     bf2raw = ome_json.get("bioformats2raw.layout")
 
+    # Everything reachable from the root zarr.json is known now, so fetch it in
+    # one concurrent batch instead of one round trip per document
+    batch = [zarr_url + "/ro-crate-metadata.json"]
+    if multiscales:
+        batch += dataset_urls(zarr_url, multiscales)
+    elif plate is not None:
+        batch += [
+            f"{zarr_url}/{field_path}/zarr.json"
+            for field_path in well_image_paths(plate, average_count)
+        ]
+    prefetch_json(batch)
+
     stats = None
 
     stats = {"written": 0}
     if multiscales:
-        stats = get_array_values(zarr_url, multiscales)
+        stats = get_array_values(zarr_url, multiscales, prefetched=True)
 
     elif plate is not None:
         log.debug("→ Using plate data")
         written_values = []
 
         # Estimating data size from a sample
-        for well in plate["wells"][:average_count]:
-            field_path = f"{well['path']}/0"
+        for field_path in well_image_paths(plate, average_count):
             plate_img_url = f"{zarr_url}/{field_path}/zarr.json"
             plate_img_json = load_json(plate_img_url)
             plate_ome_json = plate_img_json.get("attributes", {}).get("ome", {})
@@ -292,10 +497,8 @@ def load_zarr(zarr_url, average_count=5):
         log.warning("No recognized OME structure found in zarr.json")
 
     rocrate_data = load_rocrate(zarr_url)
-    if len(rocrate_data) > 0:
-        stats.update({"rocrate_found": True})
-    else:
-        stats.update({"rocrate_found": False})
+    # load_rocrate always returns the same keys; empty values mean no ro-crate
+    stats["rocrate_found"] = any(rocrate_data.values())
     stats.update(rocrate_data)
 
     stats["ome_zarr_kind"] = ome_zarr_kind
@@ -309,7 +512,6 @@ def load_zarr(zarr_url, average_count=5):
         log.error("Could not determine stats for this Zarr")
         stats = {}
 
-    stats.update(rocrate_data)
     log.debug(f"Final stats keys: {list(stats.keys())}")
     return stats
 
@@ -319,7 +521,7 @@ def load_zarr(zarr_url, average_count=5):
 # ────────────────────────────────────────────────────────────────────────────────
 def extract_zarr_urls(input_path: str) -> list[str]:
     with Path(input_path).open() as f:
-        data = yaml.safe_load(f)
+        data = yaml.load(f, Loader=YamlLoader)
 
     urls = []
     if "samples" not in data and "extended_samples" not in data:
@@ -342,6 +544,83 @@ def extract_zarr_urls(input_path: str) -> list[str]:
     return urls
 
 
+# ────────────────────────────────────────────────────────────────────────────────
+# CSV output
+# ────────────────────────────────────────────────────────────────────────────────
+# Output columns after 'url', in order; LIST_KEYS hold lists joined with commas
+ROW_KEYS = (
+    "ome_zarr_kind",
+    "written",
+    "written_human_readable",
+    "shape",
+    "shards",
+    "chunks",
+    "dimension_names",
+    "license",
+    "name",
+    "description",
+    "organismId",
+    "fbbiId",
+)
+COLUMN_NAMES = ("url", *ROW_KEYS)
+LIST_KEYS = frozenset({"shape", "shards", "chunks", "dimension_names"})
+
+
+def read_existing_urls(output_csv: Path) -> set[str]:
+    """Return the URLs already listed in the output CSV (empty if missing)."""
+    if not output_csv.exists() or output_csv.stat().st_size == 0:
+        return set()
+
+    # Only the 'url' column is needed, so let pandas' C parser skip the rest
+    if pd is not None:
+        try:
+            df = pd.read_csv(output_csv, usecols=["url"], dtype=str)
+        except ValueError:
+            log.warning(f"No 'url' column in {output_csv}")
+            return set()
+        return set(df["url"].dropna())
+
+    existing_urls = set()
+    with output_csv.open("r", newline="") as csvfile:
+        reader = csv.DictReader(csvfile)
+        for row in reader:
+            existing_urls.add(row.get("url", ""))
+    return existing_urls
+
+
+def _format_field(stats, key):
+    if key == "written":
+        return stats.get("written", 0)
+    if key == "written_human_readable":
+        return format_bytes_human_readable(stats.get("written", 0))
+    if key in LIST_KEYS:
+        return list_to_str(stats.get(key))
+    return stats.get(key, "")
+
+
+def stats_to_row(url, stats):
+    """Build a CSV row (matching COLUMN_NAMES) from load_zarr stats."""
+    return [url, *(_format_field(stats, key) for key in ROW_KEYS)]
+
+
+def append_rows(output_csv: Path, rows, header=False):
+    """Append a batch of rows to the output CSV, optionally preceded by the header."""
+    if pd is not None:
+        # dtype=object keeps each value as given: a float 'written' from a plate
+        # row must not turn the integer rows in the same batch into floats
+        df = pd.DataFrame(rows, columns=list(COLUMN_NAMES), dtype=object)
+        df.to_csv(
+            output_csv, mode="a", header=header, index=False, lineterminator="\r\n"
+        )
+        return
+
+    with output_csv.open("a", newline="") as csvfile:
+        writer = csv.writer(csvfile, delimiter=",", quoting=csv.QUOTE_MINIMAL)
+        if header:
+            writer.writerow(COLUMN_NAMES)
+        writer.writerows(rows)
+
+
 # ────────────────────────────────────────────────────────────────────────────────
 # Main entry point
 # ────────────────────────────────────────────────────────────────────────────────
@@ -357,7 +636,19 @@ def main():
     parser.add_argument(
         "--overwrite",
         action="store_true",
-        help="Overwrite existing metadata file.",
+        help="Overwrite existing metadata file and recompute all stats.",
+    )
+    parser.add_argument(
+        "--config",
+        type=Path,
+        default=HERE / "config.yaml",
+        help="YAML config listing the Zarr URLs (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=HERE / "public" / "samples" / "zarrs_metadata.csv",
+        help="CSV file to write the stats to (default: %(default)s).",
     )
     args = parser.parse_args()
 
@@ -368,95 +659,57 @@ def main():
     else:
         log.setLevel(logging.WARNING)
 
-    input_path = HERE / "config.yaml"
-    output_csv = HERE / "public" / "samples" / "zarrs_metadata.csv"
-
-    column_names = [
-        "url",
-        "ome_zarr_kind",
-        "written",
-        "written_human_readable",
-        "shape",
-        "shards",
-        "chunks",
-        "dimension_names",
-        "license",
-        "name",
-        "description",
-        "organismId",
-        "fbbiId",
-    ]
+    input_path = args.config
+    output_csv = args.output
 
     unique_urls = set(extract_zarr_urls(input_path))
     log.info(f"Found {len(unique_urls)} unique Zarr URLs")
 
     if args.overwrite:
         # Recreate the file: write header and all entries
-        with output_csv.open("w", newline="") as csvfile:
-            writer = csv.writer(csvfile, delimiter=",", quoting=csv.QUOTE_MINIMAL)
-            writer.writerow(column_names)
-
-            for url in unique_urls:
-                log.info(f"Processing {url}")
-                stats = load_zarr(url)
-
-                row = [
-                    url,
-                    stats.get("ome_zarr_kind", ""),
-                    stats.get("written", 0),
-                    format_bytes_human_readable(stats.get("written", 0)),
-                    list_to_str(stats.get("shape", "")),
-                    list_to_str(stats.get("shards", "")),
-                    list_to_str(stats.get("chunks", "")),
-                    list_to_str(stats.get("dimension_names", "")),
-                    stats.get("license", ""),
-                    stats.get("name", ""),
-                    stats.get("description", ""),
-                    stats.get("organismId", ""),
-                    stats.get("fbbiId", ""),
-                ]
-
-                writer.writerow(row)
+        output_csv.open("w").close()
+        pending_urls = unique_urls
     else:
         # Append new entries only, skipping URLs already present
-        existing_urls = set()
-        if output_csv.exists():
-            with output_csv.open("r", newline="") as csvfile:
-                reader = csv.DictReader(csvfile)
-                for row in reader:
-                    existing_urls.add(row.get("url", ""))
-
-        with output_csv.open("a", newline="") as csvfile:
-            writer = csv.writer(csvfile, delimiter=",", quoting=csv.QUOTE_MINIMAL)
-            # Write header if creating a new file
-            if not output_csv.exists() or output_csv.stat().st_size == 0:
-                writer.writerow(column_names)
-
-            for url in unique_urls:
-                if url in existing_urls:
-                    log.info(f"Skipping {url} (already in CSV)")
-                    continue
-
-                log.info(f"Processing {url}")
-                stats = load_zarr(url)
-
-                row = [
-                    url,
-                    stats.get("ome_zarr_kind", ""),
-                    stats.get("written", 0),
-                    format_bytes_human_readable(stats.get("written", 0)),
-                    list_to_str(stats.get("shape", "")),
-                    list_to_str(stats.get("shards", "")),
-                    list_to_str(stats.get("chunks", "")),
-                    list_to_str(stats.get("dimension_names", "")),
-                    stats.get("license", ""),
-                    stats.get("name", ""),
-                    stats.get("description", ""),
-                    stats.get("organismId", ""),
-                    stats.get("fbbiId", ""),
-                ]
-
-                writer.writerow(row)
+        existing_urls = read_existing_urls(output_csv)
+
+        pending_urls = []
+        for url in unique_urls:
+            if url in existing_urls:
+                log.info(f"Skipping {url} (already in CSV)")
+                continue
+            pending_urls.append(url)
+
+    # Write header if creating a new file
+    write_header = not output_csv.exists() or output_csv.stat().st_size == 0
+    rows = []
+
+    # Fetch concurrently, but only write rows from the main thread
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {}
+        for url in pending_urls:
+            log.info(f"Processing {url}")
+            # --overwrite is a full refresh, so bypass the stats cache too
+            future = executor.submit(load_zarr, url, use_stats_cache=not args.overwrite)
+            futures[future] = url
+
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                stats = future.result()
+            except Exception as e:
+                # No row, so the next append run retries this URL
+                log.error(f"Failed to process {url}, skipping: {e}")
+                continue
+            rows.append(stats_to_row(url, stats))
+
+            if len(rows) >= FLUSH_EVERY:
+                append_rows(output_csv, rows, header=write_header)
+                write_header = False
+                rows = []
+
+    if rows or write_header:
+        append_rows(output_csv, rows, header=write_header)
 
     log.info(f"✅ Done. Results written to {output_csv}")
 